@@ -9,25 +9,31 @@ from tkinter import messagebox
 import random
 import time
 import threading
+from array import array
+from types import MethodType
 
-class Chip8Emulator:
+class Chip8Core:
     """
-    Encapsulates the entire CHIP-8 virtual machine and its GUI.
+    The CHIP-8 virtual machine: memory, registers, timers, display and the
+    opcode interpreter. Has no knowledge of the GUI.
     """
+    # Fixed attribute layout keeps the hot-path state lookups cheap
+    __slots__ = (
+        'memory', 'v', 'i', 'pc', 'stack', 'sp', 'delay_timer', 'sound_timer',
+        'display_buffer', 'front_buffer', 'draw_event', 'keys', 'key_wait', 'running',
+        '_dispatch', '_decoded', '_rand', '_rand_idx',
+    )
+
     # --- Constants ---
     SCREEN_WIDTH = 64
     SCREEN_HEIGHT = 32
-    PIXEL_SCALE = 12  # How large each CHIP-8 pixel appears on screen
-    CLOCK_SPEED_HZ = 700  # Instructions per second
-    TIMER_RATE_HZ = 60    # Rate at which delay and sound timers decrement
 
-    # CHIP-8 has a 16-key hexadecimal keypad
-    KEY_MAP = {
-        '1': 0x1, '2': 0x2, '3': 0x3, '4': 0xC,
-        'q': 0x4, 'w': 0x5, 'e': 0x6, 'r': 0xD,
-        'a': 0x7, 's': 0x8, 'd': 0x9, 'f': 0xE,
-        'z': 0xA, 'x': 0x0, 'c': 0xB, 'v': 0xF,
-    }
+    # Operand extracted at decode time for each opcode family (top nibble):
+    # nnn for jumps/calls/LD I, kk for byte immediates, n for DRW
+    OPERAND_MASKS = [
+        0x000, 0xFFF, 0xFFF, 0x0FF, 0x0FF, 0x000, 0x0FF, 0x0FF,
+        0x000, 0x000, 0xFFF, 0xFFF, 0x0FF, 0x00F, 0x000, 0x000,
+    ]
 
     # Fontset for characters 0-F. Each character is 5 bytes long.
     FONTSET = [
@@ -49,37 +55,354 @@ class Chip8Emulator:
         0xF0, 0x80, 0xF0, 0x80, 0x80   # F
     ]
 
-    def __init__(self, master):
+    def __init__(self):
         """
-        Initializes the emulator's state and GUI.
+        Initializes the VM state and fontset.
         """
-        self.master = master
-        self.master.title("CATGPT CHIP-8 Emulator")
-        
-        # --- VM State ---
         self.memory = bytearray(4096)
+        self.running = False
+        self.draw_event = threading.Event()  # Set when a new frame is published
+        self._rand = random.randbytes(4096)  # Pre-drawn random bytes for Cxkk
+        self._rand_idx = 0
+        self.reset()
+        self._load_fontset()
+        self._setup_dispatch()
+
+    def reset(self):
+        """Resets the VM to its initial state, keeping memory intact."""
         self.v = bytearray(16)  # 16 8-bit general purpose registers (V0-VF)
         self.i = 0              # 16-bit index register
         self.pc = 0x200         # Program counter starts at 0x200
-        self.stack = []         # Stack for subroutines
+        self.stack = array('H', [0] * 16)  # Stack for subroutines (16 levels)
+        self.sp = 0             # Stack pointer
         self.delay_timer = 0
         self.sound_timer = 0
-        
-        # Graphics buffer (64x32 monochrome)
-        self.display_buffer = [0] * (self.SCREEN_WIDTH * self.SCREEN_HEIGHT)
-        self.draw_flag = False
 
         # Input state
-        self.keys = [0] * 16
+        self.keys = 0      # Keypad state, bit k set while key k is held
         self.key_wait = -1 # Stores which V register to put the next keypress in, -1 if not waiting
 
+        # Clear display buffer (64x32 monochrome) and publish it to update the screen.
+        # Each row is one 64-bit int with the leftmost pixel in the most significant bit.
+        self.display_buffer = [0] * self.SCREEN_HEIGHT
+        self._present()
+
+    def _present(self):
+        """Publishes a frozen copy of the display buffer for the GUI thread."""
+        # Rebinding front_buffer is atomic, so the GUI always sees a whole frame
+        # and never reads rows the emulator is still drawing into
+        self.front_buffer = self.display_buffer.copy()
+        self.draw_event.set()
+
+    def _load_fontset(self):
+        """Loads the built-in CHIP-8 fontset into memory."""
+        for i, byte in enumerate(self.FONTSET):
+            self.memory[i] = byte
+
+    def load_rom(self, rom_data):
+        """Copies ROM bytes into memory starting at 0x200."""
+        if 0x200 + len(rom_data) > len(self.memory):
+            raise IOError("ROM is too large for memory.")
+        self.memory[0x200:0x200 + len(rom_data)] = rom_data
+        self._decode_memory(0x200, 0x200 + len(rom_data))
+
+    def _setup_dispatch(self):
+        """Builds the flat opcode -> handler table of bound methods."""
+        nop = self._op_nop
+        families = [
+            None, self._op_1, self._op_2, self._op_3,
+            self._op_4, self._op_5, self._op_6, self._op_7,
+            None, self._op_9, self._op_A, self._op_B,
+            self._op_C, None, None, None,
+        ]
+        # 00NN is keyed on the low 12 bits, 8xyN on the low nibble,
+        # ExNN and FxNN on the low byte. Dxyn has a specialized handler per n.
+        op_0 = {0x0E0: self._op_00E0, 0x0EE: self._op_00EE}
+        op_8 = {
+            0x0: self._op_8xy0, 0x1: self._op_8xy1, 0x2: self._op_8xy2,
+            0x3: self._op_8xy3, 0x4: self._op_8xy4, 0x5: self._op_8xy5,
+            0x6: self._op_8xy6, 0x7: self._op_8xy7, 0xE: self._op_8xyE,
+        }
+        op_D = [MethodType(self._make_drw(n), self) for n in range(16)]
+        op_E = {0x9E: self._op_Ex9E, 0xA1: self._op_ExA1}
+        op_F = {
+            0x07: self._op_Fx07, 0x0A: self._op_Fx0A, 0x15: self._op_Fx15,
+            0x18: self._op_Fx18, 0x1E: self._op_Fx1E, 0x29: self._op_Fx29,
+            0x33: self._op_Fx33, 0x55: self._op_Fx55, 0x65: self._op_Fx65,
+        }
+
+        # Every 16-bit opcode maps straight to its final handler, so execution
+        # is a single indexed jump with no second-level decode
+        self._dispatch = []
+        for family, handler in enumerate(families):
+            if family == 0x0:
+                self._dispatch += [op_0.get(low, nop) for low in range(0x1000)]
+            elif family == 0x8:
+                self._dispatch += [op_8.get(low & 0x000F, nop) for low in range(0x1000)]
+            elif family == 0xD:
+                self._dispatch += [op_D[low & 0x000F] for low in range(0x1000)]
+            elif family == 0xE:
+                self._dispatch += [op_E.get(low & 0x00FF, nop) for low in range(0x1000)]
+            elif family == 0xF:
+                self._dispatch += [op_F.get(low & 0x00FF, nop) for low in range(0x1000)]
+            else:
+                self._dispatch += [handler] * 0x1000
+
+        # One decoded entry per address an opcode can start at
+        self._decoded = [None] * (len(self.memory) - 1)
+        self._decode_memory(0, len(self.memory))
+
+    def _decode_memory(self, start, stop):
+        """Re-decodes every cached opcode that overlaps memory[start:stop]."""
+        memory = self.memory
+        dispatch = self._dispatch
+        masks = self.OPERAND_MASKS
+        for addr in range(max(start - 1, 0), min(stop, len(memory) - 1)):
+            opcode = (memory[addr] << 8) | memory[addr + 1]
+            self._decoded[addr] = (dispatch[opcode], (opcode & 0x0F00) >> 8,
+                                   (opcode & 0x00F0) >> 4, opcode & masks[opcode >> 12])
+
+    def run(self, count):
+        """Executes up to `count` opcodes back-to-back, stopping early if the VM pauses."""
+        # Bind the hot lookup once for the whole batch
+        decoded = self._decoded
+        for _ in range(count):
+            # Fetch the opcode already decoded into its handler and operands
+            handler, x, y, operand = decoded[self.pc]
+            self.pc += 2
+            handler(x, y, operand)
+            if not self.running:
+                break
+
+    def run_frame(self, count):
+        """
+        Runs one timer tick: up to `count` opcodes followed by a single
+        delay/sound timer decrement. Returns True when the sound timer
+        has just run out.
+        """
+        self.run(count)
+
+        if self.delay_timer > 0:
+            self.delay_timer -= 1
+        if self.sound_timer > 0:
+            self.sound_timer -= 1
+            return self.sound_timer == 0
+        return False
+
+    # --- Opcode Implementations ---
+    # Every handler takes (x, y, operand); the operand is nnn, kk or n
+    # depending on the opcode family (see OPERAND_MASKS)
+
+    def _op_nop(self, x, y, operand):
+        """Unknown opcodes are ignored."""
+
+    def _op_00E0(self, x, y, operand):  # 00E0: CLS - Clear the display
+        self.display_buffer = [0] * self.SCREEN_HEIGHT
+        self._present()
+
+    def _op_00EE(self, x, y, operand):  # 00EE: RET - Return from a subroutine
+        if self.sp:
+            self.sp -= 1
+            self.pc = self.stack[self.sp]
+
+    def _op_1(self, x, y, nnn):  # 1nnn: JP addr - Jump to location nnn
+        self.pc = nnn
+
+    def _op_2(self, x, y, nnn):  # 2nnn: CALL addr - Call subroutine at nnn
+        if self.sp == len(self.stack):
+            raise IndexError("Stack overflow: more than 16 nested subroutine calls.")
+        self.stack[self.sp] = self.pc
+        self.sp += 1
+        self.pc = nnn
+
+    def _op_3(self, x, y, kk):  # 3xkk: SE Vx, byte - Skip next if Vx == kk
+        if self.v[x] == kk:
+            self.pc += 2
+
+    def _op_4(self, x, y, kk):  # 4xkk: SNE Vx, byte - Skip next if Vx != kk
+        if self.v[x] != kk:
+            self.pc += 2
+
+    def _op_5(self, x, y, operand):  # 5xy0: SE Vx, Vy - Skip next if Vx == Vy
+        if self.v[x] == self.v[y]:
+            self.pc += 2
+
+    def _op_6(self, x, y, kk):  # 6xkk: LD Vx, byte - Set Vx = kk
+        self.v[x] = kk
+
+    def _op_7(self, x, y, kk):  # 7xkk: ADD Vx, byte - Set Vx = Vx + kk
+        self.v[x] = (self.v[x] + kk) & 0xFF
+
+    def _op_8xy0(self, x, y, operand):  # 8xy0: LD Vx, Vy
+        self.v[x] = self.v[y]
+
+    def _op_8xy1(self, x, y, operand):  # 8xy1: OR Vx, Vy
+        self.v[x] |= self.v[y]
+
+    def _op_8xy2(self, x, y, operand):  # 8xy2: AND Vx, Vy
+        self.v[x] &= self.v[y]
+
+    def _op_8xy3(self, x, y, operand):  # 8xy3: XOR Vx, Vy
+        self.v[x] ^= self.v[y]
+
+    def _op_8xy4(self, x, y, operand):  # 8xy4: ADD Vx, Vy
+        result = self.v[x] + self.v[y]
+        self.v[0xF] = 1 if result > 255 else 0
+        self.v[x] = result & 0xFF
+
+    def _op_8xy5(self, x, y, operand):  # 8xy5: SUB Vx, Vy
+        self.v[0xF] = 1 if self.v[x] > self.v[y] else 0
+        self.v[x] = (self.v[x] - self.v[y]) & 0xFF
+
+    def _op_8xy6(self, x, y, operand):  # 8xy6: SHR Vx {, Vy}
+        self.v[0xF] = self.v[x] & 0x1
+        self.v[x] >>= 1
+
+    def _op_8xy7(self, x, y, operand):  # 8xy7: SUBN Vx, Vy
+        self.v[0xF] = 1 if self.v[y] > self.v[x] else 0
+        self.v[x] = (self.v[y] - self.v[x]) & 0xFF
+
+    def _op_8xyE(self, x, y, operand):  # 8xyE: SHL Vx {, Vy}
+        self.v[0xF] = (self.v[x] & 0x80) >> 7
+        self.v[x] = (self.v[x] << 1) & 0xFF
+
+    def _op_9(self, x, y, operand):  # 9xy0: SNE Vx, Vy - Skip next if Vx != Vy
+        if self.v[x] != self.v[y]:
+            self.pc += 2
+
+    def _op_A(self, x, y, nnn):  # Annn: LD I, addr - Set I = nnn
+        self.i = nnn
+
+    def _op_B(self, x, y, nnn):  # Bnnn: JP V0, addr - Jump to nnn + V0
+        self.pc = nnn + self.v[0]
+
+    def _op_C(self, x, y, kk):  # Cxkk: RND Vx, byte - Set Vx = random & kk
+        self.v[x] = self._rand[self._rand_idx] & kk
+        self._rand_idx = (self._rand_idx + 1) & 0xFFF
+        if not self._rand_idx:
+            # Draw a fresh block once the previous one is used up
+            self._rand = random.randbytes(4096)
+
+    @classmethod
+    def _make_drw(cls, n):
+        """
+        Generates the Dxyn handler for one fixed n, with the per-row sprite
+        loop unrolled into straight-line code.
+        """
+        lines = [
+            "def drw(self, x, y, n):  # Dxyn: DRW Vx, Vy, nibble",
+            f"    start_x = self.v[x] % {cls.SCREEN_WIDTH}",
+            f"    start_y = self.v[y] % {cls.SCREEN_HEIGHT}",
+            "    rows = self.display_buffer",
+            "    memory = self.memory",
+            "    i = self.i",
+            "    collision = 0",
+        ]
+        # XOR each sprite byte onto its 64-bit display row in one operation.
+        # Sprites are clipped, not wrapped, at the screen edges: pixels shifted
+        # past the right edge fall off the end, rows past the bottom are skipped.
+        for row in range(n):
+            indent = "    "
+            if row:
+                lines.append(f"    if start_y + {row} < {cls.SCREEN_HEIGHT}:")
+                indent = "        "
+            lines += [
+                f"{indent}bits = (memory[i + {row}] << 56) >> start_x",
+                f"{indent}pixels = rows[start_y + {row}]",
+                f"{indent}collision |= pixels & bits",
+                f"{indent}rows[start_y + {row}] = pixels ^ bits",
+            ]
+        # If drawing caused any pixel to be erased, set VF to 1
+        lines += [
+            "    self.v[0xF] = 1 if collision else 0",
+            "    self._present()",
+        ]
+
+        namespace = {}
+        exec("\n".join(lines), namespace)
+        return namespace["drw"]
+
+    def _op_Ex9E(self, x, y, operand):  # Ex9E: SKP Vx - Skip next if key Vx is pressed
+        if (self.keys >> self.v[x]) & 1:
+            self.pc += 2
+
+    def _op_ExA1(self, x, y, operand):  # ExA1: SKNP Vx - Skip next if key Vx not pressed
+        if not (self.keys >> self.v[x]) & 1:
+            self.pc += 2
+
+    def _op_Fx07(self, x, y, operand):  # Fx07: LD Vx, DT
+        self.v[x] = self.delay_timer
+
+    def _op_Fx0A(self, x, y, operand):  # Fx0A: LD Vx, K - Wait for key press
+        self.key_wait = x
+        self.running = False # Pause execution until key is pressed
+
+    def _op_Fx15(self, x, y, operand):  # Fx15: LD DT, Vx
+        self.delay_timer = self.v[x]
+
+    def _op_Fx18(self, x, y, operand):  # Fx18: LD ST, Vx
+        self.sound_timer = self.v[x]
+
+    def _op_Fx1E(self, x, y, operand):  # Fx1E: ADD I, Vx
+        self.i += self.v[x]
+
+    def _op_Fx29(self, x, y, operand):  # Fx29: LD F, Vx - Set I to location of sprite for digit Vx
+        self.i = self.v[x] * 5
+
+    def _op_Fx33(self, x, y, operand):  # Fx33: LD B, Vx - Store BCD of Vx
+        val = self.v[x]
+        self.memory[self.i] = val // 100
+        self.memory[self.i + 1] = (val % 100) // 10
+        self.memory[self.i + 2] = val % 10
+        self._decode_memory(self.i, self.i + 3)
+
+    def _op_Fx55(self, x, y, operand):  # Fx55: LD [I], Vx - Store registers V0 to Vx
+        end = self.i + x + 1
+        # A short slice would resize the bytearray instead of raising
+        if end > len(self.memory):
+            raise IndexError("register transfer runs past the end of memory")
+        self.memory[self.i:end] = self.v[:x + 1]
+        self._decode_memory(self.i, end)
+
+    def _op_Fx65(self, x, y, operand):  # Fx65: LD Vx, [I] - Read registers V0 to Vx
+        end = self.i + x + 1
+        if end > len(self.memory):
+            raise IndexError("register transfer runs past the end of memory")
+        self.v[:x + 1] = self.memory[self.i:end]
+
+class Chip8Emulator:
+    """
+    Tkinter front end that drives a Chip8Core and displays its screen.
+    """
+    # --- Constants ---
+    SCREEN_WIDTH = Chip8Core.SCREEN_WIDTH
+    SCREEN_HEIGHT = Chip8Core.SCREEN_HEIGHT
+    PIXEL_SCALE = 12  # How large each CHIP-8 pixel appears on screen
+    CLOCK_SPEED_HZ = 700  # Instructions per second
+    TIMER_RATE_HZ = 60    # Rate at which delay and sound timers decrement
+
+    # CHIP-8 has a 16-key hexadecimal keypad
+    KEY_MAP = {
+        '1': 0x1, '2': 0x2, '3': 0x3, '4': 0xC,
+        'q': 0x4, 'w': 0x5, 'e': 0x6, 'r': 0xD,
+        'a': 0x7, 's': 0x8, 'd': 0x9, 'f': 0xE,
+        'z': 0xA, 'x': 0x0, 'c': 0xB, 'v': 0xF,
+    }
+
+    def __init__(self, master):
+        """
+        Initializes the emulator's state and GUI.
+        """
+        self.master = master
+        self.master.title("CATGPT CHIP-8 Emulator")
+        
+        # --- VM State ---
+        self.core = Chip8Core()
+
         # --- Emulation Control ---
-        self.running = False
         self.rom_loaded = False
-        self.last_timer_update = 0
-        self.last_cycle_update = 0
+        self._shown_frame = None  # Last frame blitted to the screen
 
-        self._load_fontset()
         self._setup_gui()
         
         # Start the main emulation thread
@@ -123,26 +446,26 @@ class Chip8Emulator:
         self.canvas = tk.Canvas(self.master, width=canvas_width, height=canvas_height, bg=canvas_bg, highlightthickness=0)
         self.canvas.pack(padx=10, pady=10)
 
-        # Create rectangle objects for each pixel to be updated later
-        self.pixel_rects = []
-        for y in range(self.SCREEN_HEIGHT):
-            for x in range(self.SCREEN_WIDTH):
-                x0 = x * self.PIXEL_SCALE
-                y0 = y * self.PIXEL_SCALE
-                x1 = x0 + self.PIXEL_SCALE
-                y1 = y0 + self.PIXEL_SCALE
-                rect = self.canvas.create_rectangle(x0, y0, x1, y1, fill=canvas_bg, outline="")
-                self.pixel_rects.append(rect)
+        # The frame is blitted into a single 64x32 image, which is then zoomed
+        # onto the image shown on the canvas
+        self.frame_image = tk.PhotoImage(width=self.SCREEN_WIDTH, height=self.SCREEN_HEIGHT)
+        self.screen_image = self.frame_image.zoom(self.PIXEL_SCALE)
+        self.canvas.create_image(0, 0, anchor='nw', image=self.screen_image)
+
+        # Pixel colors are fixed at setup so drawing never queries the canvas
+        self._on_color = '#e0e0ff'
+        self._off_color = canvas_bg
+
+        # Tcl pixel colors for all 8 pixels of every possible display byte
+        self._row_fragments = [
+            ' '.join(self._on_color if (byte >> (7 - bit)) & 1 else self._off_color for bit in range(8))
+            for byte in range(256)
+        ]
 
         # --- Keyboard Bindings ---
         self.master.bind("<KeyPress>", self._key_down)
         self.master.bind("<KeyRelease>", self._key_up)
 
-    def _load_fontset(self):
-        """Loads the built-in CHIP-8 fontset into memory."""
-        for i, byte in enumerate(self.FONTSET):
-            self.memory[i] = byte
-
     def _load_rom(self):
         """Opens a file dialog to load a ROM into memory."""
         filepath = filedialog.askopenfilename(
@@ -157,255 +480,114 @@ class Chip8Emulator:
                 rom_data = f.read()
             
             self._reset() # Reset state before loading new ROM
-            
-            # Load ROM into memory starting at 0x200
-            for i, byte in enumerate(rom_data):
-                if 0x200 + i < len(self.memory):
-                    self.memory[0x200 + i] = byte
-                else:
-                    raise IOError("ROM is too large for memory.")
+            self.core.load_rom(rom_data)
             
             self.rom_loaded = True
-            self.running = True
+            self.core.running = True
             self.master.title(f"CATGPT CHIP-8 Emulator - {filepath.split('/')[-1]}")
 
         except Exception as e:
             messagebox.showerror("Error Loading ROM", f"Failed to load the ROM file.\n\n{e}")
-            self.running = False
+            self.core.running = False
             self.rom_loaded = False
 
     def _reset(self):
         """Resets the VM to its initial state."""
-        self.v = bytearray(16)
-        self.i = 0
-        self.pc = 0x200
-        self.stack = []
-        self.delay_timer = 0
-        self.sound_timer = 0
-        self.keys = [0] * 16
-        self.key_wait = -1
-        
-        # Clear display buffer and set draw flag to update the screen
-        self.display_buffer = [0] * (self.SCREEN_WIDTH * self.SCREEN_HEIGHT)
-        self.draw_flag = True
+        self.core.reset()
 
         # If a ROM was loaded, we can start running again
-        self.running = self.rom_loaded
+        self.core.running = self.rom_loaded
 
     def _key_down(self, event):
         key = event.keysym.lower()
         if key in self.KEY_MAP:
             chip8_key = self.KEY_MAP[key]
-            self.keys[chip8_key] = 1
+            core = self.core
+            core.keys |= 1 << chip8_key
             # If we are waiting for a key press (opcode Fx0A)
-            if self.key_wait != -1:
-                self.v[self.key_wait] = chip8_key
-                self.key_wait = -1
-                self.running = True # Resume execution
+            if core.key_wait != -1:
+                core.v[core.key_wait] = chip8_key
+                core.key_wait = -1
+                core.running = True # Resume execution
 
     def _key_up(self, event):
         key = event.keysym.lower()
         if key in self.KEY_MAP:
-            self.keys[self.KEY_MAP[key]] = 0
+            self.core.keys &= ~(1 << self.KEY_MAP[key])
 
     def _show_about(self):
         messagebox.showinfo("About", "CATGPT CHIP-8 Emulator v1.0\n\nA single-file Python/Tkinter emulator.\n\nKeypad Mapping:\n1 2 3 4\nQ W E R\nA S D F\nZ X C V")
     
     def _update_gui(self):
         """Periodically checks if the screen needs redrawing."""
-        if self.draw_flag:
-            self._draw_screen()
-            self.draw_flag = False
+        draw_event = self.core.draw_event
+        if draw_event.is_set():
+            # Clear first so a frame published mid-draw is not lost
+            draw_event.clear()
+            # All draws since the last tick coalesce into one blit, skipped
+            # entirely when they left the screen unchanged (e.g. a sprite
+            # erased and redrawn in place)
+            frame = self.core.front_buffer
+            if frame != self._shown_frame:
+                self._draw_screen(frame)
+                self._shown_frame = frame
         self.master.after(16, self._update_gui) # Schedule next update
 
-    def _draw_screen(self):
-        """Updates the Tkinter canvas based on the display buffer."""
-        on_color = '#e0e0ff'
-        off_color = self.canvas.cget('bg')
-        for i, pixel in enumerate(self.display_buffer):
-            color = on_color if pixel else off_color
-            self.canvas.itemconfig(self.pixel_rects[i], fill=color)
+    def _draw_screen(self, frame):
+        """Updates the Tkinter canvas from a published frame."""
+        fragments = self._row_fragments
+        # One Tcl list row per screen line, assembled from its 8 bytes and
+        # written in a single put call
+        data = '\n'.join('{' + ' '.join([fragments[byte] for byte in row.to_bytes(8, 'big')]) + '}'
+                         for row in frame)
+        self.frame_image.put(data, to=(0, 0))
+        self.screen_image.tk.call(self.screen_image, 'copy', self.frame_image, '-zoom', self.PIXEL_SCALE)
 
     def _emulation_loop(self):
         """The main loop running in a separate thread to not block the GUI."""
-        cycle_interval = 1.0 / self.CLOCK_SPEED_HZ
-        timer_interval = 1.0 / self.TIMER_RATE_HZ
-        
+        # Each timer tick runs the CPU cycles due in that interval, then sleeps
+        # until the next tick's deadline
+        tick_interval = 1.0 / self.TIMER_RATE_HZ
+        cycle_credit = 0
+        next_tick = time.perf_counter()
+        core = self.core
+
         while True:
-            if self.running:
-                current_time = time.perf_counter()
-
-                # --- Execute CPU Cycles ---
-                if current_time - self.last_cycle_update > cycle_interval:
-                    self._execute_cycle()
-                    self.last_cycle_update = current_time
-
-                # --- Update Timers ---
-                if current_time - self.last_timer_update > timer_interval:
-                    if self.delay_timer > 0:
-                        self.delay_timer -= 1
-                    if self.sound_timer > 0:
-                        self.sound_timer -= 1
-                        if self.sound_timer == 0:
-                            # In a real implementation, you'd play a sound.
-                            # For simplicity, we print to the console.
-                            print("BEEP!")
-                    self.last_timer_update = current_time
+            if core.running:
+                # Hand out the clock in whole cycles per tick and carry the
+                # remainder, so 700 Hz at 60 ticks/s alternates 11 and 12 cycles
+                cycle_credit += self.CLOCK_SPEED_HZ
+                cycles, cycle_credit = divmod(cycle_credit, self.TIMER_RATE_HZ)
+
+                # --- Execute CPU Cycles and Update Timers ---
+                try:
+                    beep = core.run_frame(cycles)
+                except Exception as e:
+                    # Stop the VM but keep this thread alive, so Reset or
+                    # Open ROM can start execution again
+                    core.running = False
+                    self.master.after_idle(messagebox.showerror, "Emulation Error",
+                                           f"The ROM stopped with an error.\n\n{e}")
+                    continue
+
+                if beep:
+                    # Ring the Tk bell on the GUI thread so the emulation
+                    # thread never blocks on console I/O
+                    self.master.after_idle(self.master.bell)
+
+                next_tick += tick_interval
+                now = time.perf_counter()
+                delay = next_tick - now
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -2 * tick_interval:
+                    # After a stall, resume from now instead of replaying
+                    # every missed tick back to back
+                    next_tick = now
             else:
                 # Sleep when not running to reduce CPU usage
                 time.sleep(0.01)
-
-    def _execute_cycle(self):
-        """Fetches, decodes, and executes a single CHIP-8 opcode."""
-        # Fetch opcode (2 bytes)
-        opcode = (self.memory[self.pc] << 8) | self.memory[self.pc + 1]
-        self.pc += 2
-
-        # Decode and execute
-        x = (opcode & 0x0F00) >> 8
-        y = (opcode & 0x00F0) >> 4
-        n = opcode & 0x000F
-        kk = opcode & 0x00FF
-        nnn = opcode & 0x0FFF
-
-        # --- Opcode Implementations ---
-        op_type = opcode & 0xF000
-
-        if op_type == 0x0000:
-            if opcode == 0x00E0:  # 00E0: CLS - Clear the display
-                self.display_buffer = [0] * (self.SCREEN_WIDTH * self.SCREEN_HEIGHT)
-                self.draw_flag = True
-            elif opcode == 0x00EE:  # 00EE: RET - Return from a subroutine
-                if self.stack:
-                    self.pc = self.stack.pop()
-
-        elif op_type == 0x1000:  # 1nnn: JP addr - Jump to location nnn
-            self.pc = nnn
-
-        elif op_type == 0x2000:  # 2nnn: CALL addr - Call subroutine at nnn
-            self.stack.append(self.pc)
-            self.pc = nnn
-
-        elif op_type == 0x3000:  # 3xkk: SE Vx, byte - Skip next if Vx == kk
-            if self.v[x] == kk:
-                self.pc += 2
-
-        elif op_type == 0x4000:  # 4xkk: SNE Vx, byte - Skip next if Vx != kk
-            if self.v[x] != kk:
-                self.pc += 2
-
-        elif op_type == 0x5000:  # 5xy0: SE Vx, Vy - Skip next if Vx == Vy
-            if self.v[x] == self.v[y]:
-                self.pc += 2
-
-        elif op_type == 0x6000:  # 6xkk: LD Vx, byte - Set Vx = kk
-            self.v[x] = kk
-
-        elif op_type == 0x7000:  # 7xkk: ADD Vx, byte - Set Vx = Vx + kk
-            self.v[x] = (self.v[x] + kk) & 0xFF
-
-        elif op_type == 0x8000:
-            op_subtype = opcode & 0x000F
-            if op_subtype == 0x0:    # 8xy0: LD Vx, Vy
-                self.v[x] = self.v[y]
-            elif op_subtype == 0x1:  # 8xy1: OR Vx, Vy
-                self.v[x] |= self.v[y]
-            elif op_subtype == 0x2:  # 8xy2: AND Vx, Vy
-                self.v[x] &= self.v[y]
-            elif op_subtype == 0x3:  # 8xy3: XOR Vx, Vy
-                self.v[x] ^= self.v[y]
-            elif op_subtype == 0x4:  # 8xy4: ADD Vx, Vy
-                result = self.v[x] + self.v[y]
-                self.v[0xF] = 1 if result > 255 else 0
-                self.v[x] = result & 0xFF
-            elif op_subtype == 0x5:  # 8xy5: SUB Vx, Vy
-                self.v[0xF] = 1 if self.v[x] > self.v[y] else 0
-                self.v[x] = (self.v[x] - self.v[y]) & 0xFF
-            elif op_subtype == 0x6:  # 8xy6: SHR Vx {, Vy}
-                self.v[0xF] = self.v[x] & 0x1
-                self.v[x] >>= 1
-            elif op_subtype == 0x7:  # 8xy7: SUBN Vx, Vy
-                self.v[0xF] = 1 if self.v[y] > self.v[x] else 0
-                self.v[x] = (self.v[y] - self.v[x]) & 0xFF
-            elif op_subtype == 0xE:  # 8xyE: SHL Vx {, Vy}
-                self.v[0xF] = (self.v[x] & 0x80) >> 7
-                self.v[x] = (self.v[x] << 1) & 0xFF
-
-        elif op_type == 0x9000:  # 9xy0: SNE Vx, Vy - Skip next if Vx != Vy
-            if self.v[x] != self.v[y]:
-                self.pc += 2
-
-        elif op_type == 0xA000:  # Annn: LD I, addr - Set I = nnn
-            self.i = nnn
-
-        elif op_type == 0xB000:  # Bnnn: JP V0, addr - Jump to nnn + V0
-            self.pc = nnn + self.v[0]
-
-        elif op_type == 0xC000:  # Cxkk: RND Vx, byte - Set Vx = random & kk
-            self.v[x] = random.randint(0, 255) & kk
-
-        elif op_type == 0xD000:  # Dxyn: DRW Vx, Vy, nibble
-            self.v[0xF] = 0
-            start_x = self.v[x] % self.SCREEN_WIDTH
-            start_y = self.v[y] % self.SCREEN_HEIGHT
-            
-            for row in range(n):
-                sprite_byte = self.memory[self.i + row]
-                pixel_y = start_y + row
-                if pixel_y >= self.SCREEN_HEIGHT:
-                    continue
-
-                for col in range(8):
-                    pixel_x = start_x + col
-                    if pixel_x >= self.SCREEN_WIDTH:
-                        continue
-                    
-                    # Check if the sprite pixel is on
-                    if (sprite_byte & (0x80 >> col)) != 0:
-                        index = pixel_x + (pixel_y * self.SCREEN_WIDTH)
-                        # If drawing causes a pixel to be erased, set VF to 1
-                        if self.display_buffer[index] == 1:
-                            self.v[0xF] = 1
-                        # XOR the pixel onto the display buffer
-                        self.display_buffer[index] ^= 1
-            
-            self.draw_flag = True
-
-        elif op_type == 0xE000:
-            op_subtype = opcode & 0x00FF
-            if op_subtype == 0x9E:  # Ex9E: SKP Vx - Skip next if key Vx is pressed
-                if self.keys[self.v[x]] == 1:
-                    self.pc += 2
-            elif op_subtype == 0xA1:  # ExA1: SKNP Vx - Skip next if key Vx not pressed
-                if self.keys[self.v[x]] == 0:
-                    self.pc += 2
-
-        elif op_type == 0xF000:
-            op_subtype = opcode & 0x00FF
-            if op_subtype == 0x07:   # Fx07: LD Vx, DT
-                self.v[x] = self.delay_timer
-            elif op_subtype == 0x0A: # Fx0A: LD Vx, K - Wait for key press
-                self.key_wait = x
-                self.running = False # Pause execution until key is pressed
-            elif op_subtype == 0x15: # Fx15: LD DT, Vx
-                self.delay_timer = self.v[x]
-            elif op_subtype == 0x18: # Fx18: LD ST, Vx
-                self.sound_timer = self.v[x]
-            elif op_subtype == 0x1E: # Fx1E: ADD I, Vx
-                self.i += self.v[x]
-            elif op_subtype == 0x29: # Fx29: LD F, Vx - Set I to location of sprite for digit Vx
-                self.i = self.v[x] * 5
-            elif op_subtype == 0x33: # Fx33: LD B, Vx - Store BCD of Vx
-                val = self.v[x]
-                self.memory[self.i] = val // 100
-                self.memory[self.i + 1] = (val % 100) // 10
-                self.memory[self.i + 2] = val % 10
-            elif op_subtype == 0x55: # Fx55: LD [I], Vx - Store registers V0 to Vx
-                for j in range(x + 1):
-                    self.memory[self.i + j] = self.v[j]
-            elif op_subtype == 0x65: # Fx65: LD Vx, [I] - Read registers V0 to Vx
-                for j in range(x + 1):
-                    self.v[j] = self.memory[self.i + j]
+                next_tick = time.perf_counter()
 
 if __name__ == "__main__":
     root = tk.Tk()